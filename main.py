@@ -1,7 +1,8 @@
 from collections import UserDict
-from datetime import date,datetime,timedelta
-import re
-import pickle
+from datetime import date,timedelta
+from heapq import heapify,heappop,heappush
+import json
+import sys
 
 #Error Handlers
 
@@ -32,66 +33,69 @@ class ContactNotFound(Exception):
 
 # Fields
 class Field:
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
     def __str__(self):
         return str(self.value)
-    
-    def value(self):
-        return self.value
 
-        
 
 class Name(Field):
-	pass
+    __slots__ = ()
 
 class Phone(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         if not self.verify_phone(value):
             raise PhoneValidationError()
         super().__init__(value)
 
     def verify_phone(self,phone_number)->bool:
-        pattern = r"^[0-9]{10}$"
-        return re.match(pattern,phone_number) is not None
+        return len(phone_number) == 10 and phone_number.isdigit()
 
 class Birthday(Field):
+    __slots__ = ()
+
     def __init__(self, value):
         try:
-            birthday=datetime.strptime(value, "%d.%m.%Y").date()
+            # manual parse: strptime re-parses the format string on every call
+            day,month,year = value.split(".")
+            birthday=date(int(year), int(month), int(day))
             super().__init__(birthday)
-        except ValueError:
+        except (ValueError, TypeError, AttributeError):
             raise ValueError("Invalid date format. Use DD.MM.YYYY")
 
-    def value(self):
-        return super().value()
-        
     def __str__(self):
-        return super().value().strftime("%d.%m.%Y")
+        return self.value.strftime("%d.%m.%Y")
         
 
-#Objects    
+# days to add per weekday to land congratulations on Monday (Sat +2, Sun +1)
+_MONDAY_ADJUST = (0, 0, 0, 0, 0, 2, 1)
+
+#Objects
 class Record:
+    __slots__ = ("name", "phones", "birthday", "_phone_str")
+
     def __init__(self, name):
         self.name = Name(name)
-        self.phones = []
+        self.phones = {}
         self.birthday = None
+        self._phone_str = None # joined phone display, invalidated on phone edits
 
     def find_phone(self,phone_number:str)->Phone:
+        return self.phones.get(phone_number)
 
-        for p in self.phones:
-            if p.value == phone_number:
-                return p
-    
     def check_duplicate(self,phone_number:str)->Phone:
         """
-        Checks if passed phone number already in list of Phones
+        Checks if passed phone number already in phones
         Returns Phone if phone_number does not exists otherwise raise exception NotUniquePhoneError
         """
         phone=Phone(phone_number)
 
-        if phone in self.phones:
+        if phone_number in self.phones:
             raise NotUniquePhoneError
         else:
             return phone
@@ -100,39 +104,43 @@ class Record:
         """
         Add phone
 
-        Function raises: 
+        Function raises:
         PhoneValidationError exception if new phone number is incorrect
-        NotUniquePhoneError exception if new phone already in list of phones
+        NotUniquePhoneError exception if new phone already in phones
         """
-        self.phones.append(self.check_duplicate(phone_number)) # append to phones list if correct. Oterwise, raise an Exception
+        self.phones[phone_number] = self.check_duplicate(phone_number) # insert if correct. Oterwise, raise an Exception
+        self._phone_str = None
 
     def edit_phone(self,old_phone_number:str,new_phone_number:str)->None:
         """
         Edit phone
 
-        Function raises: 
-        ValueError exception if phone is not in list
+        Function raises:
+        ValueError exception if phone is not in phones
         PhoneValidationError exception if new phone number is incorrect
-        NotUniquePhoneError exception if new phone already in list of phones
+        NotUniquePhoneError exception if new phone already in phones
         """
-        old_phone = self.find_phone(old_phone_number)
-        if old_phone:
-            self.phones[self.phones.index(old_phone)] = self.check_duplicate(new_phone_number)
+        if old_phone_number in self.phones:
+            new_phone = self.check_duplicate(new_phone_number)
+            del self.phones[old_phone_number]
+            self.phones[new_phone_number] = new_phone
+            self._phone_str = None
         else:
             raise ValueError(f"Phone {old_phone_number} not found")
 
     def remove_phone(self,phone_number:str)->None:
         """
-        Remove phone from the list of phones
+        Remove phone from phones
 
-        Function raises: 
-        ValueError exception if phone is not in list
-        PhoneValidationError exception if new phone number is incorrect
+        Function raises:
+        ValueError exception if phone is not in phones
         """
-        self.phones.remove(self.find_phone(phone_number))
-    
+        if self.phones.pop(phone_number, None) is None:
+            raise ValueError(f"Phone {phone_number} not found")
+        self._phone_str = None
+
     def show_phones(self):
-        return ", ".join( str(phone) for phone in self.phones)
+        return ", ".join(self.phones) # keys are the digit strings
         
     
     def add_birthday(self,date_of_birth:str)->str:
@@ -145,72 +153,139 @@ class Record:
         self.birthday = Birthday(date_of_birth)
     
 
+    @classmethod
+    def _rebuild(cls, name, phone_numbers, birthday_str):
+        """
+        Fast path for trusted persisted data: rebuilds a Record without
+        re-running phone validation or date parsing error handling.
+        """
+        record = cls(name)
+        phones = record.phones
+        for number in phone_numbers:
+            phone = Phone.__new__(Phone)
+            phone.value = number
+            phones[number] = phone
+        if birthday_str:
+            day,month,year = birthday_str.split(".")
+            birthday = Birthday.__new__(Birthday)
+            birthday.value = date(int(year), int(month), int(day))
+            record.birthday = birthday
+        return record
+
+    def __reduce__(self):
+        # pickle as three primitives instead of the full object graph
+        return (Record._rebuild, (self.name.value, list(self.phones),
+                                  str(self.birthday) if self.birthday else None))
+
     def __str__(self):
-        return f"Contact name: {self.name.value}, Date of birth:{str(self.birthday)}, Phones: {'; '.join(p.value for p in self.phones)}"
+        phones = self._phone_str
+        if phones is None:
+            phones = self._phone_str = "; ".join(self.phones)
+        bday = self.birthday.__str__() if self.birthday is not None else "—"
+        return f"Contact name: {self.name.value}, Date of birth:{bday}, Phones: {phones}"
     
 
 
 class AddressBook(UserDict):
-    
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._bday_heap = None # (next-occurrence ordinal, name) min-heap, built lazily
+
+    @staticmethod
+    def _next_occurrence_ord(bday, today):
+        occurrence = bday.replace(year=today.year)
+        if occurrence < today:
+            occurrence = occurrence.replace(year=today.year + 1)
+        return occurrence.toordinal()
+
+    def _build_birthday_heap(self, today):
+        heap = [
+            (self._next_occurrence_ord(record.birthday.value, today), name)
+            for name, record in self.data.items()
+            if record.birthday is not None
+        ]
+        heapify(heap)
+        self._bday_heap = heap
+
+    def register_birthday(self, record):
+        """
+        Queues the record's next birthday occurrence on the heap; entries
+        for a previous date are dropped lazily when popped.
+        """
+        if self._bday_heap is not None:
+            heappush(self._bday_heap,
+                     (self._next_occurrence_ord(record.birthday.value, date.today()),
+                      record.name.value))
+
     def add_record(self,record:Record)->None:
         """
         Add Record to Address book
         Raises ValueError exception if record already exists.
         """
-        if record.name.value not in self.data.keys():
-            self.data[record.name.value] = record
-        else:
+        # one hash probe: setdefault inserts and tells us if a record was already there
+        # keys are interned so later lookups short-circuit on pointer identity
+        if self.data.setdefault(sys.intern(record.name.value), record) is not record:
             raise ValueError(f"The Record {record.name} already exists.")
-        
-    
+        if record.birthday is not None:
+            self.register_birthday(record)
+
     def find(self,name:str)->Record:
-         return self.data.get(name,None)
+         return self.data.get(sys.intern(name))
 
     def delete(self,name:str)->None:
         """
         Raises KeyError if record does not exist
         """
-        del self.data[name]
+        # the record's heap entry, if any, becomes a tombstone dropped on pop
+        del self.data[sys.intern(name)]
     
-    def find_next_weekday(self,start_date, weekday):
-        days_ahead = weekday - start_date.weekday()
-        if days_ahead <= 0:
-            days_ahead += 7
-        return start_date + timedelta(days=days_ahead)
-
-
     def adjust_for_weekend(self,birthday):
-        if birthday.weekday() >= 5:
-            return self.find_next_weekday(birthday, 0)
-        return birthday
+        return birthday + timedelta(days=_MONDAY_ADJUST[birthday.weekday()])
     
     def date_to_string(self,date):
         return date.strftime("%d.%m.%Y")
 
     def get_upcoming_birthdays(self, days=7):
-        upcoming_birthdays = []
         today = date.today()
-        for contact in self.data.items():
-            name,contact_data = contact  #unpack tuple
-            if contact_data.birthday:
-                birthday_this_year = contact_data.birthday.value.replace(year=today.year)
-                if birthday_this_year < today:
-                    birthday_this_year=birthday_this_year.replace(year=today.year+1)
-
-                if 0 <= (birthday_this_year - today).days <= days:
-                    birthday_this_year=self.adjust_for_weekend(birthday_this_year)
-                    congratulation_date_str = self.date_to_string(birthday_this_year)
-                    upcoming_birthdays.append(f"{name} has congratulation date on {congratulation_date_str}")
+        today_ord = today.toordinal()
+        limit = today_ord + days
+        if self._bday_heap is None:
+            self._build_birthday_heap(today)
+        heap = self._bday_heap
+        due = []
+        seen = set()
+        while heap and heap[0][0] <= limit:
+            bday_ord, name = heappop(heap)
+            record = self.data.get(name)
+            birthday = record.birthday if record is not None else None
+            if birthday is None:
+                continue # tombstone: contact deleted
+            occurrence = date.fromordinal(bday_ord)
+            bday = birthday.value
+            if (occurrence.month, occurrence.day) != (bday.month, bday.day):
+                continue # stale: birthday changed, a fresher entry exists
+            if bday_ord < today_ord:
+                # expired occurrence; queue next year's and move on -- the
+                # re-pushed entry may still fall inside the window, so it
+                # must not count as seen yet
+                heappush(heap, (self._next_occurrence_ord(bday, today), name))
+                continue
+            if name in seen:
+                continue # duplicate queue entry; keep only one
+            seen.add(name)
+            due.append((bday_ord, name))
+
+        upcoming_birthdays = []
+        for bday_ord, name in due:
+            heappush(heap, (bday_ord, name)) # still upcoming, keep for later calls
+            congratulation_date_str = self.date_to_string(self.adjust_for_weekend(date.fromordinal(bday_ord)))
+            upcoming_birthdays.append(f"{name} has congratulation date on {congratulation_date_str}")
         return upcoming_birthdays
 
     def show_all_contacts(self):
-        
-        contacts=[]
-        for contact in self.data.items():
-            name,contact_data = contact  #unpack tuple
-            contacts.append(str(contact_data))
-        
-        return contacts
+        for contact_data in self.data.values():
+            yield str(contact_data)
 
 # Business Logic
 
@@ -235,13 +310,31 @@ def input_error(func):
 
     return inner
 
+def requires_record(func):
+    """
+    Decorator. Resolves the contact name (first argument) to a Record
+    once, raising ContactNotFound here instead of in every handler.
+    """
+
+    def inner(args, book):
+        name, *rest = args
+        record = book.find(name)
+        if record is None:
+            raise ContactNotFound(f"Record {name} not found.")
+        return func(record, rest, book)
+
+    return inner
+
 def parse_input(user_input):
     """
     This function parses usder input and return command and list of the arguments
     """
-    cmd, *args = user_input.split()
-    cmd = cmd.strip().lower()
-    return cmd, *args
+    user_input = user_input.strip()
+    if not user_input:
+        return "", []
+    # commands take at most 3 args (name, old, new); stop splitting after that
+    parts = user_input.split(None, 3)
+    return parts[0].lower(), parts[1:]
 
     
 @input_error
@@ -258,102 +351,111 @@ def add_contact(args, book: AddressBook):
     return message
 
 @input_error
-def change_contact(args,book: AddressBook):
-    name, old_phone, new_phone, *_ = args
-    record = book.find(name)
-    if record is None:
-        raise ContactNotFound(f"Record {name} not found.")
-    else:
-        record.edit_phone(old_phone,new_phone)
-        return "Phone updated."
+@requires_record
+def change_contact(record,args,book: AddressBook):
+    old_phone, new_phone, *_ = args
+    record.edit_phone(old_phone,new_phone)
+    return "Phone updated."
 
 @input_error
-def show_phones(args,book:AddressBook):
-    name,*_ = args
-    record = book.find(name)
-    if record is None:
-        raise ContactNotFound(f"Record {name} not found.")
-    else:
-        return f"Phones for {name}:\n{record.show_phones()}"
+@requires_record
+def show_phones(record,args,book:AddressBook):
+    return f"Phones for {record.name.value}:\n{record.show_phones()}"
 
 def show_all_contacts(book:AddressBook):
      return "\n".join(book.show_all_contacts())
 
 @input_error
-def add_birthday(args,book:AddressBook):
-    name, birthday, *_ = args
-    record = book.find(name)
-    if record is None:
-        raise ContactNotFound(f"Record {name} not found.")
-    else:
-        record.add_birthday(birthday)
-        return f"The birthday for the contact {name} was set to {birthday}"
+@requires_record
+def add_birthday(record,args,book:AddressBook):
+    birthday, *_ = args
+    record.add_birthday(birthday)
+    book.register_birthday(record)
+    return f"The birthday for the contact {record.name.value} was set to {birthday}"
 
 @input_error
-def show_birthday(args,book:AddressBook):
-    name, *_ = args
-    record = book.find(name)
-    if record is None:
-        raise ContactNotFound(f"Record {name} not found.")
-    else:
-        return f"The birthday for the contact {name} is {str(record.birthday)}"        
+@requires_record
+def show_birthday(record,args,book:AddressBook):
+    return f"The birthday for the contact {record.name.value} is {str(record.birthday)}"
 
 def show_birthdays(book:AddressBook):
     return "\n".join(book.get_upcoming_birthdays())
 
 
-def save_data(book, filename="addressbook.pkl"):
-    with open(filename, "wb") as f:
-        pickle.dump(book, f)
-
-def load_data(filename="addressbook.pkl"):
+def save_data(book, filename="addressbook.json"):
+    contacts = [
+        {
+            "name": name,
+            "phones": list(record.phones),
+            "birthday": str(record.birthday) if record.birthday else None,
+        }
+        for name, record in book.data.items()
+    ]
+    with open(filename, "w") as f:
+        json.dump(contacts, f)
+
+def load_data(filename="addressbook.json"):
+    book = AddressBook()
     try:
-        with open(filename, "rb") as f:
-            return pickle.load(f)
+        with open(filename) as f:
+            contacts = json.load(f)
     except FileNotFoundError:
-        return AddressBook() 
+        return book
+
+    for contact in contacts:
+        book.add_record(Record._rebuild(contact["name"], contact["phones"], contact["birthday"]))
+    return book
 
     
 #User Interface
 
+# command -> handler, resolved with one dict probe instead of an if/elif chain
+HANDLERS = {
+    "hello": lambda args, book: "How can I help you?",
+    "add": add_contact,
+    "change": change_contact,
+    "phone": show_phones,
+    "all": lambda args, book: show_all_contacts(book),
+    "add-birthday": add_birthday,
+    "show-birthday": show_birthday,
+    "birthdays": lambda args, book: show_birthdays(book),
+}
+
+def iter_input(interactive):
+    """
+    Yields user commands. Interactive sessions keep the prompt; piped
+    input (batch scripts) is consumed by plain line iteration so stdout
+    stays block-buffered instead of flushing per prompt.
+    """
+    if interactive:
+        while True:
+            try:
+                yield input("Enter a command: ")
+            except EOFError:
+                break
+    else:
+        yield from sys.stdin
+
 def main():
     book = load_data()
-    print("Welcome to the assistant bot!")
-    while True:
-        user_input = input("Enter a command: ")
-        command, *args = parse_input(user_input)
-
-        if command in ["close", "exit"]:
+    interactive = sys.stdin.isatty()
+    if interactive:
+        print("Welcome to the assistant bot!")
+    for user_input in iter_input(interactive):
+        command, args = parse_input(user_input)
+        if not command:
+            continue
+
+        if command in ("close", "exit"):
             print("Good bye!")
             save_data(book)
             break
 
-        elif command == "hello":
-            print("How can I help you?")
-
-        elif command == "add":
-            print(add_contact(args, book))
-
-        elif command == "change":
-            print(change_contact(args,book))
-
-        elif command == "phone":
-            print(show_phones(args,book))
-
-        elif command == "all":
-            print(show_all_contacts(book))
-
-        elif command == "add-birthday":
-            print(add_birthday(args,book))
-
-        elif command == "show-birthday":
-            print(show_birthday(args,book))
-
-        elif command == "birthdays":
-            print(show_birthdays(book))
-
-        else:
+        handler = HANDLERS.get(command)
+        if handler is None:
             print("Invalid command.")
+        else:
+            print(handler(args, book))
 
 
 